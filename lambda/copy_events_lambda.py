@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Lambda Function for Scheduled COPY Ingest
+This Lambda function loads events staged in S3 by the tracking Lambda into
+Redshift with a single COPY statement, then removes the loaded objects.
+Intended to run on an EventBridge schedule (e.g. every minute).
+"""
+
+import json
+import logging
+import os
+import boto3
+import redshift_connector
+
+# Configure logging
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# Initialize AWS clients
+secrets_client = boto3.client('secretsmanager')
+s3_client = boto3.client('s3')
+
+def get_redshift_credentials():
+    """Retrieve Redshift credentials from AWS Secrets Manager"""
+    secret_name = os.environ.get('REDSHIFT_SECRET_NAME')
+    if not secret_name:
+        raise ValueError("REDSHIFT_SECRET_NAME environment variable not set")
+
+    response = secrets_client.get_secret_value(SecretId=secret_name)
+    secret = json.loads(response['SecretString'])
+
+    return {
+        'host': secret['host'],
+        'port': secret['port'],
+        'database': secret['database'],
+        'user': secret['username'],
+        'password': secret['password']
+    }
+
+def list_staged_keys(bucket, prefix):
+    """List all staged event objects waiting to be loaded"""
+    keys = []
+    paginator = s3_client.get_paginator('list_objects_v2')
+    for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
+        keys.extend(obj['Key'] for obj in page.get('Contents', []))
+    return keys
+
+def copy_events(connection, bucket, keys, iam_role):
+    """COPY the staged objects into the events table via a manifest"""
+    manifest = {
+        'entries': [{'url': f"s3://{bucket}/{key}", 'mandatory': True} for key in keys]
+    }
+    manifest_key = 'manifests/copy-events.manifest'
+    s3_client.put_object(
+        Bucket=bucket,
+        Key=manifest_key,
+        Body=json.dumps(manifest).encode()
+    )
+
+    # SERIALIZETOJSON is required for 'auto' to load the nested objects the
+    # tracking Lambda stages into the SUPER columns
+    copy_query = f"""
+    COPY events FROM 's3://{bucket}/{manifest_key}'
+    IAM_ROLE '{iam_role}'
+    MANIFEST
+    FORMAT AS JSON 'auto ignorecase'
+    SERIALIZETOJSON
+    TIMEFORMAT 'epochmillisecs'
+    """
+
+    cursor = connection.cursor()
+    cursor.execute(copy_query)
+    connection.commit()
+    cursor.close()
+
+def quarantine_object(bucket, key):
+    """Move an unloadable object to the errors/ prefix so ingest can continue"""
+    s3_client.copy_object(
+        Bucket=bucket,
+        CopySource={'Bucket': bucket, 'Key': key},
+        Key=f"errors/{key}"
+    )
+    s3_client.delete_object(Bucket=bucket, Key=key)
+
+def copy_objects_individually(connection, bucket, keys, iam_role):
+    """Load objects one at a time, quarantining those that cannot be loaded.
+
+    Fallback for a failed batch COPY: retrying the identical manifest every
+    run would halt ingest forever on a single bad object.
+    """
+    loaded = []
+    for key in keys:
+        try:
+            copy_events(connection, bucket, [key], iam_role)
+            loaded.append(key)
+        except Exception as e:
+            logger.error(f"Quarantining unloadable object {key}: {str(e)}")
+            connection.rollback()
+            quarantine_object(bucket, key)
+    return loaded
+
+def delete_objects(bucket, keys):
+    """Delete loaded objects, chunked to the S3 per-request limit"""
+    for start in range(0, len(keys), 1000):
+        s3_client.delete_objects(
+            Bucket=bucket,
+            Delete={'Objects': [{'Key': key} for key in keys[start:start + 1000]]}
+        )
+
+def lambda_handler(event, context):
+    """Lambda handler for the scheduled COPY ingest"""
+    bucket = os.environ.get('EVENTS_BUCKET')
+    iam_role = os.environ.get('REDSHIFT_COPY_ROLE_ARN')
+    prefix = os.environ.get('EVENTS_PREFIX', 'events/')
+
+    if not bucket or not iam_role:
+        raise ValueError("EVENTS_BUCKET and REDSHIFT_COPY_ROLE_ARN must be set")
+
+    keys = list_staged_keys(bucket, prefix)
+    if not keys:
+        logger.info("No staged events to load")
+        return {'statusCode': 200, 'body': json.dumps({'loaded': 0})}
+
+    credentials = get_redshift_credentials()
+    connection = redshift_connector.connect(**credentials, ssl=True)
+
+    try:
+        try:
+            copy_events(connection, bucket, keys, iam_role)
+            loaded = keys
+        except Exception as e:
+            # One bad object fails the whole manifest; isolate it instead of
+            # re-running the same failing batch on every schedule tick
+            logger.error(f"Batch COPY failed, loading objects individually: {str(e)}")
+            connection.rollback()
+            loaded = copy_objects_individually(connection, bucket, keys, iam_role)
+    finally:
+        connection.close()
+
+    # Remove the loaded objects so the next run only sees new data
+    # (quarantined objects were already moved to errors/)
+    delete_objects(bucket, loaded)
+
+    logger.info(f"Loaded {len(loaded)} of {len(keys)} staged object(s) into events")
+    return {'statusCode': 200, 'body': json.dumps({'loaded': len(loaded)})}
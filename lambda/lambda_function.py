@@ -1,9 +1,16 @@
-import json
+import base64
 import logging
 import os
-import pg8000
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+import uuid
+import orjson
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any
 import boto3
 from botocore.exceptions import ClientError
 
@@ -11,26 +18,123 @@ from botocore.exceptions import ClientError
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-# Initialize AWS Secrets Manager client
-secrets_client = boto3.client('secretsmanager')
+def _dumps(obj) -> str:
+    """Serialize to a JSON string via orjson (the driver binds TEXT as str)"""
+    return orjson.dumps(obj).decode()
+
+_loads = orjson.loads
+
+# Prebuilt success body; only the JSON-encoded event id is interpolated
+_OK_BODY_TMPL = '{{"message":"Event processed successfully","event_id":{}}}'
+
+# Fields every event payload must carry
+_REQUIRED_FIELDS = frozenset(('event', 'timestamp'))
+
+# CORS headers shared by every API Gateway response
+_CORS_HEADERS = {
+    'Content-Type': 'application/json',
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Headers': 'Content-Type,X-Amz-Date,Authorization,X-Api-Key,X-Amz-Security-Token',
+    'Access-Control-Allow-Methods': 'POST,OPTIONS'
+}
+
+# redshift_connector is imported lazily to keep its dependency tree off the cold-start path
+redshift_connector = None
+
+# AWS clients created on first use and reused across invocations
+_secrets_client = None
+
+# Redshift connection reused across warm invocations
+_CONN = None
+
+# Small pool for parallel batch ingest, capped so a burst of Lambdas cannot
+# storm the Redshift leader with connections
+_POOL_MAX = 4
+_PARALLEL_THRESHOLD = 10
+_CONN_POOL = []
+_POOL_LOCK = threading.Lock()
+_EXECUTOR = None
+
+# When set, events are staged to S3 for a scheduled COPY instead of INSERTed directly
+EVENTS_BUCKET = os.environ.get('EVENTS_BUCKET')
+_s3_client = None
+
+# Parsed secret cached across invocations to avoid a Secrets Manager call per event
+_SECRET_CACHE = {'value': None, 'fetched_at': 0}
+_SECRET_TTL_SECONDS = 3600
+
+# Local HTTP port of the AWS Parameters and Secrets Lambda Extension
+_SECRETS_EXTENSION_PORT = os.environ.get('PARAMETERS_SECRETS_EXTENSION_HTTP_PORT', '2773')
+
+def _load_driver():
+    """Import redshift_connector on first use so cold starts skip its import cost"""
+    global redshift_connector
+    if redshift_connector is None:
+        import redshift_connector as _redshift_connector
+        redshift_connector = _redshift_connector
+    return redshift_connector
+
+def _get_secrets_client():
+    """Return the cached Secrets Manager client, creating it on first use"""
+    global _secrets_client
+    if _secrets_client is None:
+        _secrets_client = boto3.client('secretsmanager')
+    return _secrets_client
+
+def _fetch_secret_string(secret_name):
+    """Fetch the raw secret via the Parameters and Secrets Lambda Extension.
+
+    The extension serves secrets from a localhost cache that survives code
+    reloads; when the layer is not attached, fall back to the boto3 client.
+    """
+    token = os.environ.get('AWS_SESSION_TOKEN')
+    if token:
+        try:
+            url = (
+                f"http://localhost:{_SECRETS_EXTENSION_PORT}/secretsmanager/get"
+                f"?secretId={urllib.parse.quote(secret_name)}"
+            )
+            request = urllib.request.Request(
+                url, headers={'X-Aws-Parameters-Secrets-Token': token}
+            )
+            with urllib.request.urlopen(request, timeout=2) as response:
+                return _loads(response.read())['SecretString']
+        except urllib.error.URLError:
+            logger.info("Secrets extension unavailable, falling back to boto3")
+
+    response = _get_secrets_client().get_secret_value(SecretId=secret_name)
+    return response['SecretString']
+
+def invalidate_credentials_cache():
+    """Force the next credential lookup to go back to Secrets Manager"""
+    _SECRET_CACHE['value'] = None
+    _SECRET_CACHE['fetched_at'] = 0
 
 def get_redshift_credentials():
     """Retrieve Redshift credentials from AWS Secrets Manager"""
     try:
+        if (_SECRET_CACHE['value'] is not None
+                and time.time() - _SECRET_CACHE['fetched_at'] < _SECRET_TTL_SECONDS):
+            return dict(_SECRET_CACHE['value'])
+
         secret_name = os.environ.get('REDSHIFT_SECRET_NAME')
         if not secret_name:
             raise ValueError("REDSHIFT_SECRET_NAME environment variable not set")
 
-        response = secrets_client.get_secret_value(SecretId=secret_name)
-        secret = json.loads(response['SecretString'])
+        secret = _loads(_fetch_secret_string(secret_name))
 
-        return {
+        credentials = {
             'host': secret['host'],
             'port': secret['port'],
             'database': secret['database'],
             'user': secret['username'],
             'password': secret['password']
         }
+
+        _SECRET_CACHE['value'] = credentials
+        _SECRET_CACHE['fetched_at'] = time.time()
+
+        return dict(credentials)
     except Exception as e:
         logger.error(f"Error retrieving Redshift credentials: {str(e)}")
         raise
@@ -38,236 +142,427 @@ def get_redshift_credentials():
 def get_redshift_connection():
     """Create and return a Redshift connection with SSL"""
     try:
+        _load_driver()
         credentials = get_redshift_credentials()
-        # Add SSL configuration
-        credentials['ssl_context'] = True
-        connection = pg8000.Connection(**credentials)
+        try:
+            connection = redshift_connector.connect(**credentials, ssl=True, tcp_keepalive=True)
+        except redshift_connector.DatabaseError:
+            # Cached credentials may be stale after a secret rotation
+            logger.info("Authentication failed, refreshing cached credentials")
+            invalidate_credentials_cache()
+            credentials = get_redshift_credentials()
+            connection = redshift_connector.connect(**credentials, ssl=True, tcp_keepalive=True)
+        # Commits are issued explicitly, once per handled batch
+        connection.autocommit = False
         return connection
     except Exception as e:
         logger.error(f"Error connecting to Redshift: {str(e)}")
         raise
 
-def extract_data_fields(data: Dict[str, Any]) -> Dict[str, Optional[str]]:
-    """Extract specific fields from the data object"""
-    return {
-        'data_id': data.get('id'),
-        'data_device': data.get('device'),
-        'data_marketing': data.get('marketing'),
-        'data_source': data.get('source'),
-        'data_medium': data.get('medium'),
-        'data_campaign': data.get('campaign'),
-        'data_clickId': data.get('clickId'),
-        'data_term': data.get('term'),
-        'data_referrer': data.get('referrer'),
-        'data_storage': data.get('storage'),
-        'data_isNew': data.get('isNew'),
-        'data_count': data.get('count'),
-        'data_order_id': data.get('order_id'),
-        'data_domain': data.get('domain')
-    }
+def _connection_is_open(connection) -> bool:
+    """Local liveness check: the driver nulls its socket when the connection closes"""
+    return getattr(connection, '_sock', None) is not None
 
-def extract_user_fields(user: Dict[str, Any]) -> Dict[str, Optional[str]]:
-    """Extract specific fields from the user object"""
-    return {
-        'user_device': user.get('device'),
-        'user_session': user.get('session')
-    }
+def _get_conn():
+    """Return the cached Redshift connection, rebuilding it if closed"""
+    global _CONN
+    if _CONN is not None and _connection_is_open(_CONN):
+        return _CONN
 
-def extract_source_fields(source: Dict[str, Any]) -> Dict[str, Optional[str]]:
-    """Extract specific fields from the source object"""
-    return {
-        'source_id': source.get('id'),
-        'source_previous_id': source.get('previous_id')
-    }
+    _CONN = get_redshift_connection()
+    return _CONN
 
-def convert_timestamp(timestamp_ms: int) -> str:
-    """Convert millisecond timestamp to ISO format string"""
-    try:
-        dt = datetime.fromtimestamp(timestamp_ms / 1000.0)
-        return dt.isoformat()
-    except Exception as e:
-        logger.error(f"Error converting timestamp {timestamp_ms}: {str(e)}")
-        return datetime.now().isoformat()
+def convert_timestamp(timestamp_ms: int) -> datetime:
+    """Convert millisecond timestamp to a datetime for native TIMESTAMP binding"""
+    return datetime.utcfromtimestamp(timestamp_ms * 0.001)
 
-def insert_event_to_redshift(event_data: Dict[str, Any]) -> bool:
-    """Insert event data into Redshift table"""
+# 9999-12-31T23:59:59.999Z, the largest epoch-milliseconds datetime can represent
+_MAX_TIMESTAMP_MS = 253402300799999
+
+def _valid_timestamp(value) -> bool:
+    """True when the value is a usable epoch-milliseconds number"""
+    # bool is excluded explicitly since it subclasses int
+    if not isinstance(value, (int, float)) or isinstance(value, bool):
+        return False
+    # Values outside this range (e.g. epoch microseconds) would make
+    # convert_timestamp raise long after validation
+    return 0 <= value <= _MAX_TIMESTAMP_MS
+
+def build_event_row(event_data: Dict[str, Any]) -> tuple:
+    """Build the tuple of column values for one event"""
+    data = event_data.get('data') or {}
+    user = event_data.get('user') or {}
+    source = event_data.get('source') or {}
+
+    return (
+        convert_timestamp(event_data.get('timestamp', 0)),  # timestamp
+        event_data.get('event'),  # event
+        _dumps(data),  # data (data_* extracts live in the events_v view)
+        _dumps(event_data.get('context', {})),  # context
+        _dumps(event_data.get('custom', {})),  # custom
+        _dumps(event_data.get('globals', {})),  # globals
+        _dumps(user),  # user
+        user.get('device'),  # user_device
+        user.get('session'),  # user_session
+        _dumps(event_data.get('nested', [])),  # nested
+        _dumps(event_data.get('consent', {})),  # consent
+        event_data.get('id'),  # event_id
+        event_data.get('trigger'),  # trigger
+        event_data.get('entity'),  # entity
+        event_data.get('action'),  # action
+        event_data.get('timing'),  # timing
+        event_data.get('group'),  # group
+        event_data.get('count'),  # count
+        _dumps(event_data.get('version', {})),  # version
+        _dumps(event_data.get('source', {})),  # source
+        source.get('id'),  # source_id
+        source.get('previous_id')  # source_previous_id
+    )
+
+_COLUMNS_SQL = """
+        timestamp, event, data, context, custom, globals, "user", user_device,
+        user_session, nested, consent, event_id, trigger, entity, action, timing,
+        "group", count, version, source, source_id, source_previous_id
+"""
+
+# One placeholder per column; the SUPER columns take their JSON text via JSON_PARSE
+_PLACEHOLDERS = (
+    '%s',              # timestamp
+    '%s',              # event
+    'JSON_PARSE(%s)',  # data
+    'JSON_PARSE(%s)',  # context
+    'JSON_PARSE(%s)',  # custom
+    'JSON_PARSE(%s)',  # globals
+    'JSON_PARSE(%s)',  # user
+    '%s',              # user_device
+    '%s',              # user_session
+    'JSON_PARSE(%s)',  # nested
+    'JSON_PARSE(%s)',  # consent
+    '%s',              # event_id
+    '%s',              # trigger
+    '%s',              # entity
+    '%s',              # action
+    '%s',              # timing
+    '%s',              # group
+    '%s',              # count
+    'JSON_PARSE(%s)',  # version
+    'JSON_PARSE(%s)',  # source
+    '%s',              # source_id
+    '%s'               # source_previous_id
+)
+_ROW_PLACEHOLDER = '(' + ', '.join(_PLACEHOLDERS) + ')'
+
+# INSERT statements cached per batch size; re-executing the identical string on
+# a reused connection lets the driver reuse the server-side parse
+_INSERT_SQL_CACHE = {}
+
+def _insert_sql(batch_size: int) -> str:
+    """Return the (cached) multi-row INSERT statement for a batch size"""
+    query = _INSERT_SQL_CACHE.get(batch_size)
+    if query is None:
+        query = (
+            f"INSERT INTO events ({_COLUMNS_SQL}) VALUES "
+            + ", ".join([_ROW_PLACEHOLDER] * batch_size)
+        )
+        _INSERT_SQL_CACHE[batch_size] = query
+    return query
+
+def _get_executor():
+    """Return the shared worker pool, creating it on first use"""
+    global _EXECUTOR
+    if _EXECUTOR is None:
+        _EXECUTOR = ThreadPoolExecutor(max_workers=_POOL_MAX)
+    return _EXECUTOR
+
+def _acquire_conn():
+    """Take an open connection from the pool, or build a fresh one"""
+    with _POOL_LOCK:
+        while _CONN_POOL:
+            connection = _CONN_POOL.pop()
+            if _connection_is_open(connection):
+                return connection
+    return get_redshift_connection()
+
+def _release_conn(connection):
+    """Return a connection to the pool, closing it if the pool is full"""
+    with _POOL_LOCK:
+        if len(_CONN_POOL) < _POOL_MAX:
+            _CONN_POOL.append(connection)
+            return
+    connection.close()
+
+def _insert_chunk(events: list):
+    """Insert one chunk on its own pooled connection (runs on a worker thread)"""
+    insert_query = _insert_sql(len(events))
+    params = []
+    for event_data in events:
+        params.extend(build_event_row(event_data))
+
+    connection = _acquire_conn()
     try:
-        connection = get_redshift_connection()
         cursor = connection.cursor()
+        cursor.execute(insert_query, params)
+        connection.commit()
+        cursor.close()
+    except Exception:
+        try:
+            connection.close()
+        except Exception:
+            pass
+        raise
+    _release_conn(connection)
 
-        # Extract timestamp
-        timestamp = convert_timestamp(event_data.get('timestamp', 0))
-
-        # Extract data fields
-        data_fields = extract_data_fields(event_data.get('data', {}))
-
-        # Extract user fields
-        user_fields = extract_user_fields(event_data.get('user', {}))
-
-        # Extract source fields
-        source_fields = extract_source_fields(event_data.get('source', {}))
-
-        # Prepare the INSERT statement
-        insert_query = """
-        INSERT INTO events (
-            timestamp, event, data, data_id, data_device, data_marketing,
-            data_source, data_medium, data_campaign, data_clickId, data_term,
-            data_referrer, data_storage, data_isNew, data_count, data_order_id,
-            data_domain, context, custom, globals, "user", user_device, user_session,
-            nested, consent, event_id, trigger, entity, action, timing, "group", count,
-            version, source, source_id, source_previous_id
-        ) VALUES (
-            %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s,
-            %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s,
-            %s, %s
-        )
-        """
-
-        # Prepare values
-        values = (
-            timestamp,  # timestamp
-            event_data.get('event'),  # event
-            json.dumps(event_data.get('data', {})),  # data
-            data_fields['data_id'],  # data_id
-            data_fields['data_device'],  # data_device
-            data_fields['data_marketing'],  # data_marketing
-            data_fields['data_source'],  # data_source
-            data_fields['data_medium'],  # data_medium
-            data_fields['data_campaign'],  # data_campaign
-            data_fields['data_clickId'],  # data_clickId
-            data_fields['data_term'],  # data_term
-            data_fields['data_referrer'],  # data_referrer
-            data_fields['data_storage'],  # data_storage
-            data_fields['data_isNew'],  # data_isNew
-            data_fields['data_count'],  # data_count
-            data_fields['data_order_id'],  # data_order_id
-            data_fields['data_domain'],  # data_domain
-            json.dumps(event_data.get('context', {})),  # context
-            json.dumps(event_data.get('custom', {})),  # custom
-            json.dumps(event_data.get('globals', {})),  # globals
-            json.dumps(event_data.get('user', {})),  # user
-            user_fields['user_device'],  # user_device
-            user_fields['user_session'],  # user_session
-            json.dumps(event_data.get('nested', [])),  # nested
-            json.dumps(event_data.get('consent', {})),  # consent
-            event_data.get('id'),  # event_id
-            event_data.get('trigger'),  # trigger
-            event_data.get('entity'),  # entity
-            event_data.get('action'),  # action
-            event_data.get('timing'),  # timing
-            event_data.get('group'),  # group
-            event_data.get('count'),  # count
-            json.dumps(event_data.get('version', {})),  # version
-            json.dumps(event_data.get('source', {})),  # source
-            source_fields['source_id'],  # source_id
-            source_fields['source_previous_id']  # source_previous_id
-        )
+def _insert_events_parallel(events: list) -> bool:
+    """Fan a large batch across a few pooled connections"""
+    chunk_size = -(-len(events) // _POOL_MAX)  # ceiling division
+    chunks = [events[i:i + chunk_size] for i in range(0, len(events), chunk_size)]
+
+    futures = [_get_executor().submit(_insert_chunk, chunk) for chunk in chunks]
+
+    success = True
+    for future in futures:
+        try:
+            future.result()
+        except Exception as e:
+            logger.error(f"Error inserting event chunk: {str(e)}")
+            success = False
+
+    if success:
+        logger.info(f"Successfully inserted {len(events)} event(s) in {len(chunks)} chunk(s)")
+    return success
+
+def insert_events_to_redshift(events: list) -> bool:
+    """Insert a batch of events into Redshift with a single multi-row INSERT"""
+    global _CONN
+    if not events:
+        return True
+
+    # Large SQS/Kinesis batches are worth fanning out over the pool
+    if len(events) > _PARALLEL_THRESHOLD:
+        return _insert_events_parallel(events)
+
+    connection = None
+    try:
+        # Single multi-row INSERT and one commit for the whole batch
+        insert_query = _insert_sql(len(events))
 
-        cursor.execute(insert_query, values)
+        params = []
+        for event_data in events:
+            params.extend(build_event_row(event_data))
+
+        connection = _get_conn()
+        cursor = connection.cursor()
+        try:
+            cursor.execute(insert_query, params)
+        except (redshift_connector.InterfaceError, OSError):
+            # The socket check is local-only, so a dead connection surfaces
+            # here; rebuild it and retry the statement once
+            logger.info("Connection lost during insert, reconnecting")
+            _CONN = None
+            connection = _get_conn()
+            cursor = connection.cursor()
+            cursor.execute(insert_query, params)
         connection.commit()
 
         cursor.close()
-        connection.close()
 
-        logger.info(f"Successfully inserted event with ID: {event_data.get('id')}")
+        logger.info(f"Successfully inserted {len(events)} event(s)")
         return True
 
     except Exception as e:
-        logger.error(f"Error inserting event to Redshift: {str(e)}")
-        if 'connection' in locals():
-            connection.rollback()
-            connection.close()
+        logger.error(f"Error inserting events to Redshift: {str(e)}")
+        if connection is not None:
+            # Roll back the failed transaction but keep the connection cached;
+            # drop it only if the rollback shows it is unusable
+            try:
+                connection.rollback()
+            except Exception:
+                _CONN = None
+        else:
+            _CONN = None
         return False
 
+def insert_event_to_redshift(event_data: Dict[str, Any]) -> bool:
+    """Insert a single event into Redshift table"""
+    return insert_events_to_redshift([event_data])
+
+def _get_s3():
+    """Return the cached S3 client, creating it on first use"""
+    global _s3_client
+    if _s3_client is None:
+        _s3_client = boto3.client('s3')
+    return _s3_client
+
+def build_event_record(event_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Flatten one event into a column-name keyed dict for COPY FORMAT JSON"""
+    data = event_data.get('data') or {}
+    user = event_data.get('user') or {}
+    source = event_data.get('source') or {}
+
+    # The SUPER columns stay nested objects here so COPY loads them natively
+    return {
+        'timestamp': event_data.get('timestamp', 0),
+        'event': event_data.get('event'),
+        'data': data,
+        'context': event_data.get('context', {}),
+        'custom': event_data.get('custom', {}),
+        'globals': event_data.get('globals', {}),
+        'user': user,
+        'user_device': user.get('device'),
+        'user_session': user.get('session'),
+        'nested': event_data.get('nested', []),
+        'consent': event_data.get('consent', {}),
+        'event_id': event_data.get('id'),
+        'trigger': event_data.get('trigger'),
+        'entity': event_data.get('entity'),
+        'action': event_data.get('action'),
+        'timing': event_data.get('timing'),
+        'group': event_data.get('group'),
+        'count': event_data.get('count'),
+        'version': event_data.get('version', {}),
+        'source': event_data.get('source', {}),
+        'source_id': source.get('id'),
+        'source_previous_id': source.get('previous_id')
+    }
+
+def stage_events_to_s3(events: list) -> bool:
+    """Stage a batch of events to S3 as newline-delimited JSON for COPY"""
+    try:
+        now = datetime.utcnow()
+        key = f"events/{now:%Y/%m/%d/%H}/{uuid.uuid4()}.json"
+        body = b'\n'.join(orjson.dumps(build_event_record(e)) for e in events)
+
+        _get_s3().put_object(Bucket=EVENTS_BUCKET, Key=key, Body=body)
+
+        logger.info(f"Staged {len(events)} event(s) to s3://{EVENTS_BUCKET}/{key}")
+        return True
+    except Exception as e:
+        logger.error(f"Error staging events to S3: {str(e)}")
+        return False
+
+def persist_events(events: list) -> bool:
+    """Write a batch of events via S3 staging when configured, else direct INSERT"""
+    if EVENTS_BUCKET:
+        return stage_events_to_s3(events)
+    return insert_events_to_redshift(events)
+
+def _record_payload(record: dict):
+    """Extract the raw event payload from an SQS or Kinesis record"""
+    # SQS delivers the message body directly
+    if 'body' in record:
+        return record['body']
+    # Kinesis wraps the payload base64-encoded under kinesis.data
+    kinesis_data = record.get('kinesis', {}).get('data')
+    if kinesis_data is not None:
+        return base64.b64decode(kinesis_data)
+    return None
+
+def _handle_records(records: list) -> dict:
+    """Handle an SQS/Kinesis batch trigger by inserting all records at once"""
+    events = []
+    for record in records:
+        payload = _record_payload(record)
+        if payload is None:
+            raise ValueError(
+                f"Unrecognized record shape from source {record.get('eventSource')}"
+            )
+        try:
+            event_data = _loads(payload)
+        except orjson.JSONDecodeError as e:
+            logger.error(f"Skipping record with invalid JSON: {str(e)}")
+            continue
+
+        # One invalid record must not fail the whole multi-row INSERT
+        missing_fields = _REQUIRED_FIELDS.difference(event_data)
+        if missing_fields:
+            logger.error(f"Skipping record missing required fields: {sorted(missing_fields)}")
+            continue
+        if not _valid_timestamp(event_data.get('timestamp')):
+            logger.error(f"Skipping record with invalid timestamp: {event_data.get('timestamp')!r}")
+            continue
+
+        events.append(event_data)
+
+    success = persist_events(events)
+    if not success:
+        raise RuntimeError(f"Failed to insert batch of {len(events)} events")
+
+    return {'statusCode': 200, 'body': _dumps({'inserted': len(events)})}
+
 def lambda_handler(event, context):
     """AWS Lambda handler function"""
-    try:
-        # Log the incoming event
-        logger.info(f"Received event: {json.dumps(event)}")
+    # Only serialize the full event when DEBUG logging is on; at INFO the
+    # request id is enough and saves a multi-KB dump per invocation
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Received event: %s", _dumps(event))
+    else:
+        request_id = event.get('requestContext', {}).get('requestId')
+        logger.info(f"Received request: {request_id}")
 
+    # SQS/Kinesis batch trigger: insert all records in one statement. This is
+    # dispatched outside the catch-all below on purpose — a failed batch must
+    # raise so the event source mapping retries it; returning a 500 response
+    # dict would count as success and delete the records from the queue.
+    if 'Records' in event:
+        return _handle_records(event['Records'])
+
+    try:
         # Parse the request body
         if 'body' not in event:
             return {
                 'statusCode': 400,
-                'headers': {
-                    'Content-Type': 'application/json',
-                    'Access-Control-Allow-Origin': '*',
-                    'Access-Control-Allow-Headers': 'Content-Type,X-Amz-Date,Authorization,X-Api-Key,X-Amz-Security-Token',
-                    'Access-Control-Allow-Methods': 'POST,OPTIONS'
-                },
-                'body': json.dumps({'error': 'Missing request body'})
+                'headers': _CORS_HEADERS,
+                'body': _dumps({'error': 'Missing request body'})
             }
 
         # Parse JSON body
         try:
-            event_data = json.loads(event['body'])
-        except json.JSONDecodeError as e:
+            event_data = _loads(event['body'])
+        except orjson.JSONDecodeError as e:
             logger.error(f"Invalid JSON in request body: {str(e)}")
             return {
                 'statusCode': 400,
-                'headers': {
-                    'Content-Type': 'application/json',
-                    'Access-Control-Allow-Origin': '*',
-                    'Access-Control-Allow-Headers': 'Content-Type,X-Amz-Date,Authorization,X-Api-Key,X-Amz-Security-Token',
-                    'Access-Control-Allow-Methods': 'POST,OPTIONS'
-                },
-                'body': json.dumps({'error': 'Invalid JSON in request body'})
+                'headers': _CORS_HEADERS,
+                'body': _dumps({'error': 'Invalid JSON in request body'})
             }
 
         # Validate required fields
-        required_fields = ['event', 'timestamp']
-        missing_fields = [field for field in required_fields if field not in event_data]
+        missing_fields = _REQUIRED_FIELDS.difference(event_data)
 
         if missing_fields:
             return {
                 'statusCode': 400,
-                'headers': {
-                    'Content-Type': 'application/json',
-                    'Access-Control-Allow-Origin': '*',
-                    'Access-Control-Allow-Headers': 'Content-Type,X-Amz-Date,Authorization,X-Api-Key,X-Amz-Security-Token',
-                    'Access-Control-Allow-Methods': 'POST,OPTIONS'
-                },
-                'body': json.dumps({'error': f'Missing required fields: {missing_fields}'})
+                'headers': _CORS_HEADERS,
+                'body': _dumps({'error': f'Missing required fields: {sorted(missing_fields)}'})
+            }
+
+        if not _valid_timestamp(event_data.get('timestamp')):
+            return {
+                'statusCode': 400,
+                'headers': _CORS_HEADERS,
+                'body': _dumps({'error': 'Field timestamp must be a millisecond epoch number'})
             }
 
-        # Insert event to Redshift
-        success = insert_event_to_redshift(event_data)
+        # Persist event (S3 staging when configured, direct INSERT otherwise)
+        success = persist_events([event_data])
 
         if success:
             return {
                 'statusCode': 200,
-                'headers': {
-                    'Content-Type': 'application/json',
-                    'Access-Control-Allow-Origin': '*',
-                    'Access-Control-Allow-Headers': 'Content-Type,X-Amz-Date,Authorization,X-Api-Key,X-Amz-Security-Token',
-                    'Access-Control-Allow-Methods': 'POST,OPTIONS'
-                },
-                'body': json.dumps({
-                    'message': 'Event processed successfully',
-                    'event_id': event_data.get('id')
-                })
+                'headers': _CORS_HEADERS,
+                'body': _OK_BODY_TMPL.format(_dumps(event_data.get('id')))
             }
         else:
             return {
                 'statusCode': 500,
-                'headers': {
-                    'Content-Type': 'application/json',
-                    'Access-Control-Allow-Origin': '*',
-                    'Access-Control-Allow-Headers': 'Content-Type,X-Amz-Date,Authorization,X-Api-Key,X-Amz-Security-Token',
-                    'Access-Control-Allow-Methods': 'POST,OPTIONS'
-                },
-                'body': json.dumps({'error': 'Failed to process event'})
+                'headers': _CORS_HEADERS,
+                'body': _dumps({'error': 'Failed to process event'})
             }
 
     except Exception as e:
         logger.error(f"Unexpected error: {str(e)}")
         return {
             'statusCode': 500,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-                'Access-Control-Allow-Headers': 'Content-Type,X-Amz-Date,Authorization,X-Api-Key,X-Amz-Security-Token',
-                'Access-Control-Allow-Methods': 'POST,OPTIONS'
-            },
-            'body': json.dumps({'error': 'Internal server error'})
+            'headers': _CORS_HEADERS,
+            'body': _dumps({'error': 'Internal server error'})
         } 
\ No newline at end of file
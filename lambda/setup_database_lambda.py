@@ -6,7 +6,7 @@ This Lambda function creates the necessary tables and users for the tracking Lam
 
 import json
 import boto3
-import pg8000
+import redshift_connector
 import time
 import sys
 import os
@@ -31,13 +31,13 @@ def create_database_schema(host, port, database, username, password):
     """Create the database schema"""
     try:
         # Connect to Redshift with SSL
-        conn = pg8000.connect(
+        conn = redshift_connector.connect(
             host=host,
             port=port,
             database=database,
             user=username,
             password=password,
-            ssl_context=True
+            ssl=True
         )
         
         cursor = conn.cursor()
@@ -48,29 +48,15 @@ def create_database_schema(host, port, database, username, password):
             id INTEGER IDENTITY(1,1) PRIMARY KEY,
             timestamp TIMESTAMP NOT NULL,
             event VARCHAR(255) NOT NULL,
-            data TEXT,
-            data_id VARCHAR(255),
-            data_device VARCHAR(255),
-            data_marketing TEXT,
-            data_source VARCHAR(255),
-            data_medium VARCHAR(255),
-            data_campaign VARCHAR(255),
-            data_clickId VARCHAR(255),
-            data_term VARCHAR(255),
-            data_referrer VARCHAR(500),
-            data_storage VARCHAR(255),
-            data_isNew BOOLEAN,
-            data_count INTEGER,
-            data_order_id VARCHAR(255),
-            data_domain VARCHAR(255),
-            context TEXT,
-            custom TEXT,
-            globals TEXT,
-            "user" TEXT,
+            data SUPER,
+            context SUPER,
+            custom SUPER,
+            globals SUPER,
+            "user" SUPER,
             user_device VARCHAR(255),
             user_session VARCHAR(255),
-            nested TEXT,
-            consent TEXT,
+            nested SUPER,
+            consent SUPER,
             event_id VARCHAR(255),
             trigger VARCHAR(255),
             entity VARCHAR(255),
@@ -78,17 +64,46 @@ def create_database_schema(host, port, database, username, password):
             timing VARCHAR(255),
             "group" VARCHAR(255),
             count INTEGER,
-            version TEXT,
-            source TEXT,
+            version SUPER,
+            source SUPER,
             source_id VARCHAR(255),
             source_previous_id VARCHAR(255),
             createdAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        );
+        )
+        DISTSTYLE AUTO
+        SORTKEY (timestamp);
         """
         
         cursor.execute(create_events_table)
-        print("✅ Events table created successfully") 
-        
+        print("✅ Events table created successfully")
+
+        # Late-binding view materializing the data_* extracts from the SUPER blob
+        # via PartiQL navigation, so the table itself stores the payload only once
+        create_events_view = """
+        CREATE OR REPLACE VIEW events_v AS
+        SELECT
+            *,
+            data.id::varchar AS data_id,
+            data.device::varchar AS data_device,
+            data.marketing::varchar AS data_marketing,
+            data.source::varchar AS data_source,
+            data.medium::varchar AS data_medium,
+            data.campaign::varchar AS data_campaign,
+            data.clickId::varchar AS data_clickId,
+            data.term::varchar AS data_term,
+            data.referrer::varchar AS data_referrer,
+            data.storage::varchar AS data_storage,
+            data.isNew::boolean AS data_isNew,
+            data.count::int AS data_count,
+            data.order_id::varchar AS data_order_id,
+            data.domain::varchar AS data_domain
+        FROM public.events
+        WITH NO SCHEMA BINDING;
+        """
+
+        cursor.execute(create_events_view)
+        print("✅ Events view created successfully")
+
         conn.commit()
         cursor.close()
         conn.close()
@@ -128,8 +143,6 @@ def lambda_handler(event, context):
     
     # Create database schema
     print("🏗️  Creating database schema...")
-    print(credentials)
-    print("password: ", credentials.get('password'))
 
     success = create_database_schema(
         host=credentials.get('host'),